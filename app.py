@@ -1,7 +1,25 @@
+import os
+import tempfile
+from functools import lru_cache
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+import pyarrow as pa
+
+
+# orjson encodes the figures st.plotly_chart sends to the browser (numpy arrays natively)
+pio.json.config.default_engine = 'orjson'
+
+# shared st.plotly_chart config: no Plotly logo, figures resize with their container
+PLOTLY_CONFIG = {'displayModeBar': True, 'displaylogo': False, 'responsive': True}
+
+# cleaned-data cache written by load_data(); bump the version whenever the
+# read schema or the cleaning steps change, so stale caches are not reused
+PARQUET_CACHE = 'vgsales.v1.parquet'
 
 
 # page configuration
@@ -13,29 +31,164 @@ st.set_page_config(
 
 
 # Data Loading and Preparation
-@st.cache_data
+@st.cache_resource
 def load_data():
     """
     Loads, cleans, and prepares the vgsales.csv dataset.
+
+    Cached as a shared resource (no copy per access), so the returned
+    DataFrame is read-only: derive new frames, never modify it in place.
+
+    The sidebar constants (genres, year bounds) are derived here once,
+    so reruns read them from the cache instead of rescanning columns.
     
+    The cleaned rows are also written to PARQUET_CACHE, which later
+    cold starts read instead of parsing the CSV until the CSV changes.
+    An unreadable cache file is ignored and rebuilt.
+
     Returns:
-        pd.DataFrame: A cleaned DataFrame.
-        None: If the file is not found.
+        tuple: (pd.DataFrame, list, int, int) the cleaned DataFrame, the
+        genres in order of appearance, and the first and last year.
+        (None, None, None, None): If the file is not found.
 
     """
     try:
-        df = pd.read_csv("vgsales.csv")
-        
-        df.dropna(subset=['Year', 'Publisher'], inplace=True)
-        
-        df['Year'] = df['Year'].astype(int)
+        # columnar copy of the cleaned CSV, reused on cold starts for as long as the CSV is unchanged
+        df = None
+        if os.path.exists(PARQUET_CACHE) and os.path.getmtime(PARQUET_CACHE) >= os.path.getmtime("vgsales.csv"):
+            try:
+                df = pd.read_parquet(PARQUET_CACHE, dtype_backend="pyarrow")
+                df.index = df.index.astype('int64')
+            except (OSError, pa.ArrowException):
+                df = None  # unreadable cache: rebuild it from the CSV below
+
+        if df is None:
+            # multithreaded Arrow parser, Arrow-backed columns parsed straight into
+            # their final widths: years 1980-2020 fit in int16, sales (millions, 2 decimals) in float32
+            schema = {'Rank': pd.ArrowDtype(pa.int32()), 'Year': pd.ArrowDtype(pa.int16())}
+            schema.update({col: pd.ArrowDtype(pa.string()) for col in ('Name', 'Platform', 'Genre', 'Publisher')})
+            schema.update({col: pd.ArrowDtype(pa.float32()) for col in ('NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales')})
+            df = pd.read_csv("vgsales.csv", engine="pyarrow", dtype_backend="pyarrow", dtype=schema)
+
+            df.dropna(subset=['Year', 'Publisher'], inplace=True)
+
+            # write to a temp file and rename it into place, so a killed or concurrent
+            # start never leaves a half-written cache behind
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(PARQUET_CACHE)),
+                    prefix=os.path.basename(PARQUET_CACHE) + '.', suffix='.tmp'
+                )
+                os.close(fd)
+                df.to_parquet(tmp_path)
+                os.replace(tmp_path, PARQUET_CACHE)
+            except (OSError, pa.ArrowException):
+                # read-only checkout: keep parsing the CSV
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        # NumPy-backed numeric columns for the filter index and the charts, no nulls left after the dropna
+        df['Year'] = df['Year'].astype('int16')
+        for col in ('NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales'):
+            df[col] = df[col].astype('float32')
+
+        # categorical text columns, isin()/groupby() work on integer codes instead of strings
+        for col in ('Genre', 'Platform', 'Publisher', 'Name'):
+            df[col] = df[col].astype('category')
         
-        return df
+        return df, df['Genre'].unique().tolist(), int(df['Year'].min()), int(df['Year'].max())
     except FileNotFoundError:
         st.error("Error: 'vgsales.csv' not found. Please ensure the file is in the same directory as 'app.py'.")
-        return None
+        return None, None, None, None
+
+@st.cache_resource
+def filter_index():
+    """
+    Precomputes the NumPy arrays the sidebar filter runs on.
+
+    Row positions are sorted by release year, so a year range is a
+    contiguous slice; the genre codes are stored in the same order.
+    Read-only, shared like load_data().
+
+    Returns:
+        tuple: (np.ndarray, np.ndarray, np.ndarray) the sorted years, the
+        matching row positions, and their Genre category codes.
+
+    """
+    df = load_data()[0]
+    years = df['Year'].to_numpy()
+    order = np.argsort(years, kind='stable')
+    return years[order], order, df['Genre'].cat.codes.to_numpy()[order]
+
+@st.cache_data
+def filter_data(genres, year_from, year_to):
+    """
+    Applies the sidebar filters to the dataset.
+
+    Cached on the filter values, so reruns with unchanged filters
+    (tab switches, chart settings) skip the masking.
 
-df = load_data()
+    Args:
+        genres (tuple): Selected genres, sorted so the cache key is stable.
+        year_from (int): First year of the range (inclusive).
+        year_to (int): Last year of the range (inclusive).
+
+    Returns:
+        pd.DataFrame: The filtered rows.
+
+    """
+    df = load_data()[0]
+
+    # binary search the year range, then compare int8 genre codes on that slice only
+    sorted_years, order, genre_codes = filter_index()
+    lo = np.searchsorted(sorted_years, year_from, side='left')
+    hi = np.searchsorted(sorted_years, year_to, side='right')
+    positions = order[lo:hi]
+    if len(genres) < len(df['Genre'].cat.categories):  # every genre selected: nothing to mask
+        selected_codes = df['Genre'].cat.categories.get_indexer(list(genres))
+        positions = positions[np.isin(genre_codes[lo:hi], selected_codes)]
+
+    return df.iloc[np.sort(positions)]  # keep the original (rank) row order
+
+def downsample(df_sub, n=5000):
+    """
+    Draws a genre-stratified random sample for point-per-row charts.
+
+    Args:
+        df_sub (pd.DataFrame): Rows to sample from.
+        n (int): Approximate maximum number of rows to keep.
+
+    Returns:
+        pd.DataFrame: df_sub itself if it is small enough, otherwise a
+        sample where every genre keeps its share of the rows.
+
+    """
+    if len(df_sub) <= n:
+        return df_sub
+    sample = df_sub.groupby('Genre', observed=True).sample(frac=n / len(df_sub), random_state=0)
+    return sample.sort_index()  # back to rank order, keeps the legend order stable
+
+@lru_cache(maxsize=None)
+def hex_to_rgba(hex_color, alpha=0.6):
+    """
+    Converts a '#rrggbb' color to an rgba() string.
+
+    Args:
+        hex_color (str): Hex color, with or without the leading '#'.
+        alpha (float): Opacity of the returned color.
+
+    Returns:
+        str: The color as 'rgba(r,g,b,alpha)'.
+
+    """
+    hex_color = hex_color.lstrip('#')
+    r = int(hex_color[0:2], 16)
+    g = int(hex_color[2:4], 16)
+    b = int(hex_color[4:6], 16)
+    return f'rgba({r},{g},{b},{alpha})'
+
+df, all_genres, min_year, max_year = load_data()
 
 if df is None:
     st.stop()
@@ -47,8 +200,6 @@ if df is None:
 st.sidebar.header("Filter Options 🎮")
 
 
-all_genres = df['Genre'].unique()
-
 selected_genres = st.sidebar.multiselect(
     'Select Genre(s):',
     options=all_genres,
@@ -56,10 +207,6 @@ selected_genres = st.sidebar.multiselect(
 )
 
 
-min_year = int(df['Year'].min())
-max_year = int(df['Year'].max())
-
-
 selected_year_range = st.sidebar.slider(
     'Select Year Range:',
     min_value=min_year,
@@ -68,11 +215,10 @@ selected_year_range = st.sidebar.slider(
 )
 
 
-df_filtered = df[
-    (df['Genre'].isin(selected_genres)) &
-    (df['Year'] >= selected_year_range[0]) &
-    (df['Year'] <= selected_year_range[1])
-]
+# hashable filter key, passed to the cached chart builders below instead of the DataFrame
+filters = (tuple(sorted(selected_genres)), *selected_year_range)
+
+df_filtered = filter_data(*filters)
 
 # sidebar-small-info
 st.sidebar.info(f"{len(df_filtered)} games found based on selected filters.")
@@ -94,7 +240,30 @@ tab_list = [
     "🌍 Heatmap (Hilmi)",
     "🏆 Top 20 Games (Hilmi)"
 ]
-tabs = st.tabs(tab_list)
+# on_change="rerun" makes the tabs lazy: only the selected tab's body runs (tabs[i].open)
+tabs = st.tabs(tab_list, key='active_tab', on_change='rerun')
+
+# Widgets of a closed tab are not rendered, and Streamlit drops the state of
+# widgets missing from a run. Re-assigning their keys every run keeps each
+# tab's settings while another tab is open. The defaults are seeded here once
+# instead of passed to the widgets, which would clash with the re-assignment.
+TAB_WIDGET_DEFAULTS = {
+    'scatter_log_scale': False, 'scatter_size_metric': True, 'scatter_show_trend': False,
+    'box_metric': 'Global_Sales', 'box_view_mode': 'Focused',
+    'treemap_path': ['Publisher', 'Genre', 'Platform'], 'treemap_color': 'Global_Sales',
+    'sankey_genre_selector': 'All',
+    'line_rangeslider': False,
+    'parcoords_per_game': False,
+    'heatmap_use_filters': False,
+}
+# data-dependent defaults: the publisher pick falls back to the first option,
+# the heatmap year is set to the latest available year next to its slider
+TAB_WIDGET_KEYS = (*TAB_WIDGET_DEFAULTS, 'line_publisher', 'heatmap_single_year')
+for widget_key, default in TAB_WIDGET_DEFAULTS.items():
+    st.session_state.setdefault(widget_key, default)
+for widget_key in TAB_WIDGET_KEYS:
+    if widget_key in st.session_state:
+        st.session_state[widget_key] = st.session_state[widget_key]
 
 
 # -----------------
@@ -102,65 +271,116 @@ tabs = st.tabs(tab_list)
 # -----------------
 
 # Chart 1: Scatter Plot 
-with tabs[0]:
-    st.header("Chart 1: Regional Sales Correlation (Interactive Scatter)")
-    st.markdown("Examine the relationship between North American (`NA_Sales`) and European (`EU_Sales`) sales. The marginal histograms on the sides show the distribution density of the data.")
-
-    # colums for interactions
-    c1, c2 = st.columns([1, 3])
-
-    with c1:
-        st.markdown("### ⚙️ Settings")
-        # logarithmic scale
-        log_scale = st.checkbox(
-            "Logarithmic Scale", 
-            value=False, 
-            help="Use this to visualize small and large sales values clearly on the same chart."
-        )
-        
-        # point sizing 
-        size_metric = st.checkbox(
-            "Size points by Global Sales", 
-            value=True, 
-            help="If checked, the size of the bubbles will indicate the total global sales success."
-        )
-        
-        # trendline   
-        ## ModuleNotFoundError
-        show_trend = st.checkbox(
-            "Show Trendline (OLS)", 
-            value=False, 
-            help="Adds a linear regression line to visualize the general correlation trend."
-        )
+@st.cache_data
+def build_fig_scatter(filters, log_scale, size_metric, show_trend):
+    """
+    Builds the NA vs. EU sales scatter with marginal histograms.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+        log_scale (bool): Use logarithmic axes.
+        size_metric (bool): Size the points by Global_Sales.
+        show_trend (bool): Add an OLS trendline.
+
+    Returns:
+        tuple: (go.Figure, int) the scatter figure and the number of games
+        it draws.
 
-    with c2:
-        # Create Scatter Plot
-        fig_scatter = px.scatter(
-            df_filtered,  
-            x='NA_Sales',
-            y='EU_Sales',
-            color='Genre',              # Color differentiation by Genre
-            size='Global_Sales' if size_metric else None, # Bubble size logic
-            hover_name='Name',          # Show Game Name on hover
-            hover_data=['Platform', 'Year', 'Publisher'],
-            title="NA Sales vs. EU Sales (with Marginal Distributions)",
-            marginal_x="histogram",     # Top margin: Histogram
-            marginal_y="histogram",     # Right margin: Histogram
-            trendline="ols" if show_trend else None, # Optional trendline
-            log_x=log_scale,            # Logarithmic axis settings
-            log_y=log_scale,
-            template="plotly_white",    # Clean background
-            opacity=0.7                 # Transparency for overlapping points
+    """
+    # bounded point count, render time no longer grows with the filter width
+    df_all = filter_data(*filters)
+    df_sub = downsample(df_all)
+
+    fig_scatter = px.scatter(
+        df_sub,  
+        x='NA_Sales',
+        y='EU_Sales',
+        color='Genre',              # Color differentiation by Genre
+        size='Global_Sales' if size_metric else None, # Bubble size logic
+        hover_name='Name',          # Show Game Name on hover
+        hover_data=['Platform', 'Year', 'Publisher'],
+        title="NA Sales vs. EU Sales (with Marginal Distributions)",
+        marginal_x="histogram",     # Top margin: Histogram
+        marginal_y="histogram",     # Right margin: Histogram
+        log_x=log_scale,            # Logarithmic axis settings
+        log_y=log_scale,
+        template="plotly_white",    # Clean background
+        opacity=0.7,                # Transparency for overlapping points
+        render_mode='webgl'         # WebGL instead of SVG, thousands of points stay responsive
+    )
+    
+    # Bubble sizes are float32: print the Global_Sales hover value to 2 decimals, not as the raw float
+    if size_metric:
+        fig_scatter.for_each_trace(
+            lambda t: t.update(hovertemplate=t.hovertemplate.replace('%{marker.size}', '%{marker.size:.2f}')),
+            selector=dict(type='scattergl')
         )
+
+    # Styling adjustments
+    fig_scatter.update_layout(
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=600
+    )
+
+    # Optional trendline: one least-squares fit over all filtered games, no statsmodels needed
+    if show_trend and len(df_all) > 1:
+        x = df_all['NA_Sales'].to_numpy(dtype=float)
+        y = df_all['EU_Sales'].to_numpy(dtype=float)
+        slope, intercept = np.polyfit(x, y, 1)
+        r2 = np.corrcoef(x, y)[0, 1] ** 2
+        xs = np.unique(x)  # every distinct x, so the line stays straight in data space on log axes too
+        fig_scatter.add_trace(go.Scattergl(
+            x=xs,
+            y=slope * xs + intercept,
+            mode='lines',
+            name=f'OLS y={slope:.3f}x+{intercept:.3f}',
+            line=dict(color='#444444', width=2),
+            hovertemplate=(
+                f'<b>OLS trendline</b><br>EU_Sales = {slope:.4f} * NA_Sales + {intercept:.4f}'
+                f'<br>R<sup>2</sup>={r2:.4f}<br><br>NA_Sales=%{{x}}<br>EU_Sales=%{{y}} <b>(trend)</b><extra></extra>'
+            )
+        ))
+    return fig_scatter, len(df_sub)
+
+with tabs[0]:
+    if tabs[0].open:
+        st.header("Chart 1: Regional Sales Correlation (Interactive Scatter)")
+        st.markdown("Examine the relationship between North American (`NA_Sales`) and European (`EU_Sales`) sales. The marginal histograms on the sides show the distribution density of the data.")
+
+        # colums for interactions
+        c1, c2 = st.columns([1, 3])
+
+        with c1:
+            st.markdown("### ⚙️ Settings")
+            # logarithmic scale
+            log_scale = st.checkbox(
+                "Logarithmic Scale", 
+                help="Use this to visualize small and large sales values clearly on the same chart.",
+                key='scatter_log_scale'
+            )
         
-        # Styling adjustments
-        fig_scatter.update_layout(
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            margin=dict(l=20, r=20, t=50, b=20),
-            height=600
-        )
+            # point sizing 
+            size_metric = st.checkbox(
+                "Size points by Global Sales", 
+                help="If checked, the size of the bubbles will indicate the total global sales success.",
+                key='scatter_size_metric'
+            )
         
-        st.plotly_chart(fig_scatter, use_container_width=True, key='plot_scatter')
+            # trendline   
+            show_trend = st.checkbox(
+                "Show Trendline (OLS)", 
+                help="Adds a linear regression line to visualize the general correlation trend.",
+                key='scatter_show_trend'
+            )
+
+        with c2:
+            # Create Scatter Plot
+            fig_scatter, n_points = build_fig_scatter(filters, log_scale, size_metric, show_trend)
+        
+            st.plotly_chart(fig_scatter, use_container_width=True, key='plot_scatter', config=PLOTLY_CONFIG)
+            if n_points < len(df_filtered):
+                st.caption(f"Showing {n_points:,} of {len(df_filtered):,} games (random sample, stratified by genre).")
 
 
 
@@ -169,35 +389,27 @@ with tabs[0]:
 
 
 # Chart 2: Box Plot 
-with tabs[1]:
-    st.header("Chart 2: Sales Distribution Analytics")
-    st.markdown("Compare the sales distributions. By default, the view is **focused** on the main cluster of games to make the boxes visible.")
+@st.cache_data
+def build_fig_box(filters, y_axis_option, view_mode):
+    """
+    Builds the notched sales box plot per genre.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+        y_axis_option (str): Sales column shown on the y-axis.
+        view_mode (str): "Focused" clips the y-axis, anything else autoranges.
+
+    Returns:
+        go.Figure: The box plot figure.
+
+    """
+    df_sub = filter_data(*filters)
 
-    # layout focused (default), all range
-    c1, c2 = st.columns([2, 2])
-    
-    with c1:
-        y_axis_option = st.radio(
-            "Select Sales Metric:",
-            ['Global_Sales', 'NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales'],
-            horizontal=True,
-            format_func=lambda x: x.replace('_', ' ')
-        )
-    
-    with c2:
-        view_mode = st.radio(
-            "Y-Axis Scale Mode:",
-            ["Focused", "Full Range (All Outliers)"],
-            index=0,  
-            horizontal=True,
-            help="Focused mode clips extreme outliers to show the box distribution clearly."
-        )
-    
     # Custom Color Palette
     color_discrete_map = px.colors.qualitative.Bold
 
     fig_box = px.box(
-        df_filtered, 
+        df_sub, 
         x='Genre',
         y=y_axis_option,
         color='Genre',
@@ -220,65 +432,131 @@ with tabs[1]:
         legend_title_text="Genre List",
         height=600
     )
+    return fig_box
+
+with tabs[1]:
+    if tabs[1].open:
+        st.header("Chart 2: Sales Distribution Analytics")
+        st.markdown("Compare the sales distributions. By default, the view is **focused** on the main cluster of games to make the boxes visible.")
+
+        # layout focused (default), all range
+        c1, c2 = st.columns([2, 2])
+    
+        with c1:
+            y_axis_option = st.radio(
+                "Select Sales Metric:",
+                ['Global_Sales', 'NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales'],
+                horizontal=True,
+                format_func=lambda x: x.replace('_', ' '),
+                key='box_metric'
+            )
+    
+        with c2:
+            view_mode = st.radio(
+                "Y-Axis Scale Mode:",
+                ["Focused", "Full Range (All Outliers)"],
+                horizontal=True,
+                help="Focused mode clips extreme outliers to show the box distribution clearly.",
+                key='box_view_mode'
+            )
     
-    st.plotly_chart(fig_box, use_container_width=True, key='plot_box')
+        fig_box = build_fig_box(filters, y_axis_option, view_mode)
+    
+        st.plotly_chart(fig_box, use_container_width=True, key='plot_box', config=PLOTLY_CONFIG)
 
 
 
 
 ## Chart 3: Treemap 
 # (Dynamic Hierarchy)
-with tabs[2]:
-    st.header("Chart 3: Market Hierarchy Explorer (Dynamic Treemap)")
-    st.markdown("Who dominates the market? Explore the data from different angles by dynamically changing the hierarchy order.")
+@st.cache_data
+def build_fig_tree(filters, selected_path, color_metric):
+    """
+    Builds the market hierarchy treemap.
 
-    col_tree1, col_tree2 = st.columns([1, 3])
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+        selected_path (tuple): Hierarchy columns, top -> down.
+        color_metric (str): Column used to color the boxes.
 
-    with col_tree1:
-        st.info("💡 Tip: By changing the hierarchy order, you can answer questions like 'Which Publisher is strong in which Genre?' or 'Which Publisher dominates which Platform?'.")
-        
-        #dynamic hierarchy selection, interaction
-        default_path = ['Publisher', 'Genre', 'Platform']
-        path_options = ['Publisher', 'Genre', 'Platform', 'Year']
-        
-        selected_path = st.multiselect(
-            "Select Hierarchy Order (Top -> Down):",
-            options=path_options,
-            default=default_path
-        )
-        
-        #if empty
-        if not selected_path:
-            selected_path = default_path
-
-        #coloring metric, interaction
-        color_metric = st.selectbox(
-            "Color Boxes By:",
-            options=['Global_Sales', 'Year'],
-            format_func=lambda x: "Total Sales" if x == 'Global_Sales' else "Release Year (New vs Old)"
+    Returns:
+        go.Figure: The treemap figure.
+
+    """
+    # Treemaps are often more meaningful with the full dataset context, 
+    # but here we use the filtered data to respect user's global filters.
+    df_sub = filter_data(*filters)
+
+    # Pre-aggregate to one row per leaf so px.treemap only lays out the hierarchy.
+    # px colors a box by the sales-weighted mean of the color column, so each leaf
+    # carries that mean in 'Color' and px weights it again for the parent boxes.
+    path = list(selected_path)
+    if color_metric in path:
+        # color by a path level is discrete, the level column itself is enough
+        df_tree = df_sub.groupby(path, observed=True, as_index=False)['Global_Sales'].sum()
+        color_col = color_metric
+    else:
+        df_tree = (
+            df_sub.assign(Color=df_sub[color_metric] * df_sub['Global_Sales'])
+            .groupby(path, observed=True, as_index=False)[['Global_Sales', 'Color']].sum()
         )
+        df_tree['Color'] = df_tree['Color'] / df_tree['Global_Sales']
+        color_col = 'Color'
+
+    fig_tree = px.treemap(
+        df_tree,
+        path=[px.Constant("All Games")] + path,
+        values='Global_Sales',
+        color=color_col, 
+        labels={'Color': color_metric},
+        # Red-Blue for Years, Viridis (Green-Purple) for Sales magnitude
+        color_continuous_scale='RdBu_r' if color_metric == 'Year' else 'Viridis', 
+        title=f"Market Hierarchy by {' > '.join(selected_path)}"
+    )
+    
+    fig_tree.update_traces(
+        root_color="lightgrey",
+        hovertemplate='<b>%{label}</b><br>Sales: %{value:.2f}M<br>%{parent}'
+    )
+    fig_tree.update_layout(margin=dict(t=50, l=0, r=0, b=0))
+    return fig_tree
+
+with tabs[2]:
+    if tabs[2].open:
+        st.header("Chart 3: Market Hierarchy Explorer (Dynamic Treemap)")
+        st.markdown("Who dominates the market? Explore the data from different angles by dynamically changing the hierarchy order.")
 
-    with col_tree2:
-        # Treemaps are often more meaningful with the full dataset context, 
-        # but here we use df_filtered to respect user's global filters.
+        col_tree1, col_tree2 = st.columns([1, 3])
+
+        with col_tree1:
+            st.info("💡 Tip: By changing the hierarchy order, you can answer questions like 'Which Publisher is strong in which Genre?' or 'Which Publisher dominates which Platform?'.")
         
-        fig_tree = px.treemap(
-            df_filtered,
-            path=[px.Constant("All Games")] + selected_path,
-            values='Global_Sales',
-            color=color_metric, 
-            # Red-Blue for Years, Viridis (Green-Purple) for Sales magnitude
-            color_continuous_scale='RdBu_r' if color_metric == 'Year' else 'Viridis', 
-            title=f"Market Hierarchy by {' > '.join(selected_path)}"
-        )
+            #dynamic hierarchy selection, interaction
+            default_path = ['Publisher', 'Genre', 'Platform']
+            path_options = ['Publisher', 'Genre', 'Platform', 'Year']
         
-        fig_tree.update_traces(
-            root_color="lightgrey",
-            hovertemplate='<b>%{label}</b><br>Sales: %{value:.2f}M<br>%{parent}'
-        )
-        fig_tree.update_layout(margin=dict(t=50, l=0, r=0, b=0))
+            selected_path = st.multiselect(
+                "Select Hierarchy Order (Top -> Down):",
+                options=path_options,
+                key='treemap_path'
+            )
         
-        st.plotly_chart(fig_tree, use_container_width=True, key='plot_treemap')
+            #if empty
+            if not selected_path:
+                selected_path = default_path
+
+            #coloring metric, interaction
+            color_metric = st.selectbox(
+                "Color Boxes By:",
+                options=['Global_Sales', 'Year'],
+                format_func=lambda x: "Total Sales" if x == 'Global_Sales' else "Release Year (New vs Old)",
+                key='treemap_color'
+            )
+
+        with col_tree2:
+            fig_tree = build_fig_tree(filters, tuple(selected_path), color_metric)
+        
+            st.plotly_chart(fig_tree, use_container_width=True, key='plot_treemap', config=PLOTLY_CONFIG)
 
 
 
@@ -287,38 +565,54 @@ with tabs[2]:
 
 # CHARTS of Hilmi   
 
-with tabs[6]:
-    st.header("Parallel Coordinates (Hilmi): Regional Sales Profile by Game")
-    st.markdown("Interactively explore how games compare across regional sales dimensions. Hovering on lines isn't natively supported for labels in Parcoords, so a sample table is provided below for cross-reference.")
+@st.cache_data
+def build_fig_parcoords(filters, per_game):
+    """
+    Builds the regional sales parallel coordinates.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+        per_game (bool): One line per game (top 500) instead of one
+            median line per genre.
 
+    Returns:
+        tuple: (go.Figure, pd.DataFrame) the figure and the plotted rows.
+
+    """
     # Prepare parallel coordinates dataframe
     numeric_cols = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales']
     needed_cols = ['Name', 'Genre'] + numeric_cols
-    df_par = df_filtered.copy()
+    df_par = filter_data(*filters)
     df_par = df_par.dropna(subset=numeric_cols)
     df_par = df_par[needed_cols].copy()
 
-    # Keep a reasonable number of rows for plotting performance
-    df_display = df_par.sort_values('Global_Sales', ascending=False).head(500).reset_index(drop=True)
+    if per_game:
+        # Keep a reasonable number of rows for plotting performance
+        df_display = df_par.sort_values('Global_Sales', ascending=False).head(500).reset_index(drop=True)
+    else:
+        # Genre profile: one median line per genre carries the same comparison in ~12 lines
+        df_display = df_par.groupby('Genre', observed=True)[numeric_cols].median().reset_index()
+        df_display.insert(0, 'Name', df_display['Genre'].astype(str) + ' (median)')
 
     # Encode Genre as categorical numeric for coloring and provide tick labels
-    genres = df_display['Genre'].astype(str).unique().tolist()
-    genre_to_id = {g: i for i, g in enumerate(genres)}
-    genre_ids = df_display['Genre'].map(genre_to_id).tolist()
+    # factorize numbers genres in order of appearance in one pass, no per-row dict lookup
+    codes, uniques = pd.factorize(df_display['Genre'])
+    genres = uniques.astype(str).tolist()
+    genre_ids = codes.astype(np.int8)
 
     # Build dimensions for Parcoords
     dimensions = []
     # Add Genre as the first (categorical) axis
     dimensions.append(dict(
         label='Genre',
-        values=[genre_to_id.get(g, -1) for g in df_display['Genre']],
+        values=genre_ids,
         tickvals=list(range(len(genres))),
         ticktext=genres
     ))
 
     for col in numeric_cols:
-        col_vals = df_display[col].astype(float).tolist()
-        dimensions.append(dict(label=col.replace('_', ' '), values=col_vals, range=[min(col_vals), max(col_vals)]))
+        col_vals = df_display[col].to_numpy(dtype=np.float32)  # typed array, base64 in the figure JSON
+        dimensions.append(dict(label=col.replace('_', ' '), values=col_vals, range=[float(col_vals.min()), float(col_vals.max())]))
 
     customdata = df_display[['Name', 'Genre']].values
 
@@ -330,22 +624,78 @@ with tabs[6]:
 
     fig_par = go.Figure(data=[par_trace])
     fig_par.update_layout(height=600, margin=dict(t=40, b=10, l=10, r=10))
+    return fig_par, df_display
 
-    st.plotly_chart(fig_par, use_container_width=True, key='plot_parcoords')
+with tabs[6]:
+    if tabs[6].open:
+        st.header("Parallel Coordinates (Hilmi): Regional Sales Profile by Genre")
+        intro = st.empty()  # filled once per_game is known, the wording depends on the view
+
+        per_game = st.checkbox(
+            'Show individual games (top 500)',
+            help="Unchecked, each genre is drawn as a single line of its median regional sales.",
+            key='parcoords_per_game'
+        )
+        if per_game:
+            intro.markdown("Interactively explore how games compare across regional sales dimensions. Hovering on lines isn't natively supported for labels in Parcoords, so a sample table is provided below for cross-reference.")
+        else:
+            intro.markdown("Interactively explore how genres compare across regional sales dimensions (median per genre). Hovering on lines isn't natively supported for labels in Parcoords, so the plotted rows are listed below for cross-reference.")
 
-    st.markdown('**Sample rows (for hover cross-reference)** — match a line by its index:')
-    df_sample = df_display.reset_index().rename(columns={'index': 'row_index'})
-    st.dataframe(df_sample[['row_index', 'Name', 'Genre'] + numeric_cols].head(200))
+        numeric_cols = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales']
+        fig_par, df_display = build_fig_parcoords(filters, per_game)
 
-with tabs[7]:
-    st.header("Team Heatmap: Top Game Regional Footprint Over Recent Years")
-    st.markdown("For each year, paint continents by which region (Americas / Europe / Japan / Other) the year's top-selling game sold in. Use the selector below to pick a single year (the list shows all available years).")
+        st.plotly_chart(fig_par, use_container_width=True, key='plot_parcoords', config=PLOTLY_CONFIG)
+        if per_game and len(df_display) < len(df_filtered):
+            st.caption(f"Showing the top {len(df_display):,} of {len(df_filtered):,} games by global sales.")
+
+        if per_game:
+            st.markdown('**Sample rows (for hover cross-reference)** — match a line by its index:')
+        else:
+            st.markdown('**Plotted rows (one median line per genre)** — match a line by its index:')
+        df_sample = df_display.reset_index().rename(columns={'index': 'row_index'})
+        st.dataframe(df_sample[['row_index', 'Name', 'Genre'] + numeric_cols].head(200))
+
+@st.cache_resource
+def country_regions():
+    """
+    Maps every gapminder country to one of the four sales regions.
+
+    Returns:
+        pd.DataFrame: 'country' and 'region' columns, region being one of
+        Americas / Europe / Japan / Other.
+
+    """
+    # Load gapminder country->continent mapping (built-in to plotly)
+    gap = px.data.gapminder()[['country', 'continent']].drop_duplicates('country')
+    country = gap['country']
+    continent = gap['continent']
+    # Ensure Turkey is treated as Europe per user request
+    region = np.select(
+        [country == 'Japan', (continent == 'Europe') | (country == 'Turkey'), continent == 'Americas'],
+        ['Japan', 'Europe', 'Americas'],
+        default='Other'
+    )
+    return pd.DataFrame({'country': country.to_numpy(), 'region': region})
 
-    # Controls
-    use_filters = st.checkbox('Respect sidebar filters (genre/year)?', value=False, key='heatmap_use_filters')
+@st.cache_data
+def build_heatmap_records(filters):
+    """
+    Builds the per-year, per-country records behind the heatmap.
+
+    Args:
+        filters (tuple or None): Sidebar filter key, see filter_data().
+            None uses the full dataset.
+
+    Returns:
+        tuple: (pd.DataFrame, dict) one row per year and country with the
+        year's top game and its regional sales, and a year -> top game map.
+        (None, {}) when no year has any game.
+
+    """
+    df_all, _, first_year, last_year = load_data()
 
     # Decide source dataframe
-    src_df = df_filtered if use_filters else df.copy()
+    src_df = filter_data(*filters) if filters is not None else df_all.copy()
 
     # --- Fallback rows for specific years (2018, 2019) for this heatmap as well ---
     fallback_rows = [
@@ -375,180 +725,174 @@ with tabs[7]:
         src_df = pd.concat([fb_compatible, src_df], ignore_index=True, sort=False)
 
     # Determine the years to include (use a continuous inclusive range between dataset min/max)
-    min_year_heat = int(df['Year'].min())
-    max_year_heat = int(df['Year'].max())
-    years_to_use = list(range(min_year_heat, max_year_heat + 1))
+    years_to_use = list(range(first_year, last_year + 1))
+
+    # Each year's top seller in one groupby pass instead of a filter + sort per year
+    # Only the columns the records need are gathered, not the whole rows
+    sales_cols = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']
+    top_rows = src_df.loc[src_df.groupby('Year')['Global_Sales'].idxmax(), ['Year', 'Name'] + sales_cols]
+    top_rows = top_rows[top_rows['Year'].isin(years_to_use)]
+
+    if top_rows.empty:
+        return None, {}
+
+    # Regional sales of each year's top game in long form, one row per (year, region)
+    regional = top_rows.rename(columns={
+        'Year': 'year', 'Name': 'game',
+        'NA_Sales': 'Americas', 'EU_Sales': 'Europe', 'JP_Sales': 'Japan', 'Other_Sales': 'Other'
+    })
+    regional['game'] = regional['game'].astype(object)
+    regional = regional.melt(id_vars=['year', 'game'], var_name='region', value_name='value')
+
+    # Every country takes the value of the region it belongs to
+    heat_df = country_regions().merge(regional, on='region').sort_values('year', kind='stable', ignore_index=True)
+    heat_df = heat_df[['year', 'country', 'region', 'value', 'game']]
+    heat_df['year'] = heat_df['year'].astype(int)
+    heat_df['value'] = heat_df['value'].astype('float32')
 
-    # Load gapminder country->continent mapping (built-in to plotly)
-    gap = px.data.gapminder()
-    country_continent = gap[['country', 'continent']].drop_duplicates().set_index('country')['continent'].to_dict()
-    # Ensure Turkey is treated as Europe per user request
-    country_continent_override = {'Turkey': 'Europe'}
-    country_continent.update(country_continent_override)
-
-    records = []
-    for yr in years_to_use:
-        df_year = src_df[src_df['Year'] == int(yr)]
-        if df_year.empty:
-            continue
-        top = df_year.sort_values('Global_Sales', ascending=False).iloc[0]
-        game_name = top['Name']
-        # regional sales for that game
-        regional = {
-            'Americas': float(top.get('NA_Sales', 0.0)),
-            'Europe': float(top.get('EU_Sales', 0.0)),
-            'Japan': float(top.get('JP_Sales', 0.0)),
-            'Other': float(top.get('Other_Sales', 0.0))
-        }
+    # Normalize values per frame for color scaling uniformity if desired
+    # Use absolute sales for color
 
-        # For each country in gapminder list, assign a value equal to the regional sales for the region it belongs to
-        for country, cont in country_continent.items():
-            # Determine simplified region
-            if country == 'Japan':
-                region = 'Japan'
-            elif cont == 'Europe' or country == 'Turkey':
-                region = 'Europe'
-            elif cont == 'Americas':
-                region = 'Americas'
-            else:
-                region = 'Other'
+    # Build a mapping year -> top game (we already stored game per record)
+    top_game_per_year = heat_df.groupby('year', observed=True)['game'].first().to_dict()
+    return heat_df, top_game_per_year
 
-            value = regional.get(region, 0.0)
-            records.append({'year': int(yr), 'country': country, 'region': region, 'value': value, 'game': game_name})
+with tabs[7]:
+    if tabs[7].open:
+        st.header("Team Heatmap: Top Game Regional Footprint Over Recent Years")
+        st.markdown("For each year, paint continents by which region (Americas / Europe / Japan / Other) the year's top-selling game sold in. Use the selector below to pick a single year (the list shows all available years).")
 
-    if not records:
-        st.warning('No data available for the selected years/filters.')
-        st.stop()
+        # Controls
+        use_filters = st.checkbox('Respect sidebar filters (genre/year)?', key='heatmap_use_filters')
 
-    heat_df = pd.DataFrame.from_records(records)
+        # Unchecked, every filter state shares the full-dataset entry
+        heat_df, top_game_per_year = build_heatmap_records(filters if use_filters else None)
 
-    # Normalize values per frame for color scaling uniformity if desired
-    # Use absolute sales for color
+        if heat_df is None:
+            st.warning('No data available for the selected years/filters.')
+            st.stop()
 
-    # Build a mapping year -> top game (we already stored game per record)
-    top_game_per_year = heat_df.groupby('year')['game'].first().to_dict()
+        # Year selection control (show above the heatmap) - show only years that actually have heatmap records
+        available_years = sorted(heat_df['year'].unique().tolist())
 
-    # Year selection control (show above the heatmap) - show only years that actually have heatmap records
-    available_years = sorted(heat_df['year'].unique().tolist())
+        if not available_years:
+            st.warning('No years available to display.')
+            st.stop()
 
-    if not available_years:
-        st.warning('No years available to display.')
-        st.stop()
+        # Default (and fallback when the toggle drops the kept year): the latest year
+        if st.session_state.get('heatmap_single_year') not in available_years:
+            st.session_state['heatmap_single_year'] = available_years[-1]
 
-    sel_year = st.select_slider(
-        'Select Year to Display:',
-        options=available_years,
-        value=available_years[-1],
-        key='heatmap_single_year'
-    )
+        sel_year = st.select_slider(
+            'Select Year to Display:',
+            options=available_years,
+            key='heatmap_single_year'
+        )
 
-    # Filter heat_df for the selected year only
-    heat_df_year = heat_df[heat_df['year'] == int(sel_year)]
-    if heat_df_year.empty:
-        st.warning(f'No data available for the selected year: {sel_year}')
-        st.stop()
-
-    # Create a static choropleth for the selected year
-    fig_heat = px.choropleth(
-        heat_df_year,
-        locations='country',
-        locationmode='country names',
-        color='value',
-        hover_name='country',
-        hover_data=['game', 'region', 'value'],
-        color_continuous_scale='YlOrRd',
-        projection='natural earth',
-        title=f'Top-Selling Game Regional Sales in {sel_year}'
-    )
+        # Filter heat_df for the selected year only
+        heat_df_year = heat_df[heat_df['year'] == int(sel_year)]
+        if heat_df_year.empty:
+            st.warning(f'No data available for the selected year: {sel_year}')
+            st.stop()
+
+        # Create a static choropleth for the selected year
+        fig_heat = px.choropleth(
+            heat_df_year,
+            locations='country',
+            locationmode='country names',
+            color='value',
+            hover_name='country',
+            hover_data=['game', 'region', 'value'],
+            color_continuous_scale='YlOrRd',
+            projection='natural earth',
+            title=f'Top-Selling Game Regional Sales in {sel_year}'
+        )
 
-    # Remove country border white lines and set dark theme
-    # Add a thin border so countries show an outline and style the hoverlabel
-    fig_heat.update_traces(marker_line_width=0.6, marker_line_color='rgba(255,255,255,0.15)')
-    fig_heat.update_geos(showland=True, landcolor='rgb(10,10,10)', showcountries=False, showcoastlines=False, showframe=False, showocean=True, oceancolor='rgb(0,0,0)', bgcolor='rgb(0,0,0)')
+        # Remove country border white lines and set dark theme
+        # Add a thin border so countries show an outline and style the hoverlabel
+        fig_heat.update_traces(marker_line_width=0.6, marker_line_color='rgba(255,255,255,0.15)')
+        fig_heat.update_geos(showland=True, landcolor='rgb(10,10,10)', showcountries=False, showcoastlines=False, showframe=False, showocean=True, oceancolor='rgb(0,0,0)', bgcolor='rgb(0,0,0)')
 
-    # Hover/tooltip styling to improve perceived "highlight" on mouseover
-    fig_heat.update_traces(
-        hovertemplate="<b>%{hovertext}</b><br>Region: %{customdata[1]}<br>Sales: %{z:.2f}M<extra></extra>",
-        hovertext=heat_df_year['country'],
-        customdata=heat_df_year[['game', 'region', 'value']].values
-    )
+        # Hover/tooltip styling to improve perceived "highlight" on mouseover
+        fig_heat.update_traces(
+            hovertemplate="<b>%{hovertext}</b><br>Region: %{customdata[1]}<br>Sales: %{z:.2f}M<extra></extra>",
+            hovertext=heat_df_year['country'],
+            customdata=heat_df_year[['game', 'region', 'value']].values
+        )
 
-    fig_heat.update_layout(
-        plot_bgcolor='black',
-        paper_bgcolor='black',
-        font_color='white',
-        coloraxis_colorbar=dict(title='Sales (M)'),
-        margin=dict(t=60, b=0, l=0, r=0),
-        hovermode='closest',
-        hoverlabel=dict(bgcolor='white', font_size=12, font_color='black', bordercolor='rgba(255,255,255,0.1)')
-    )
+        fig_heat.update_layout(
+            plot_bgcolor='black',
+            paper_bgcolor='black',
+            font_color='white',
+            coloraxis_colorbar=dict(title='Sales (M)'),
+            margin=dict(t=60, b=0, l=0, r=0),
+            hovermode='closest',
+            hoverlabel=dict(bgcolor='white', font_size=12, font_color='black', bordercolor='rgba(255,255,255,0.1)')
+        )
 
-    # Annotation showing top game's name for the selected year
-    top_game = top_game_per_year.get(int(sel_year), '')
-    fig_heat.update_layout(annotations=[dict(
-        text=f"Top game: <b>{top_game}</b>",
-        x=0.02, y=0.02, xref='paper', yref='paper',
-        showarrow=False, font=dict(color='white', size=14), align='left'
-    )])
+        # Annotation showing top game's name for the selected year
+        top_game = top_game_per_year.get(int(sel_year), '')
+        fig_heat.update_layout(annotations=[dict(
+            text=f"Top game: <b>{top_game}</b>",
+            x=0.02, y=0.02, xref='paper', yref='paper',
+            showarrow=False, font=dict(color='white', size=14), align='left'
+        )])
 
-    st.plotly_chart(fig_heat, use_container_width=True, key='plot_heat_tab7')
+        st.plotly_chart(fig_heat, use_container_width=True, key='plot_heat_tab7', config=PLOTLY_CONFIG)
 
-    st.markdown('**Explanation:** Select a year above — the map shows that year\'s top-selling game and colors countries based on that game\'s regional sales footprint (Americas, Europe, Japan, Other).')
+        st.markdown('**Explanation:** Select a year above — the map shows that year\'s top-selling game and colors countries based on that game\'s regional sales footprint (Americas, Europe, Japan, Other).')
 
-with tabs[3]:
-    st.header("Stacked Area Chart: Platform Popularity Over Years")
-    st.markdown("This chart shows the sales trends of the top 12 platforms by total sales over the years in a stacked format. It visualizes the rise and fall of platforms (for example, PS2 being replaced by PS3).")
-    
+@st.cache_data
+def build_fig_stacked(filters):
+    """
+    Builds the stacked area chart of the top 12 platforms' yearly sales.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+
+    Returns:
+        go.Figure: The stacked area figure.
+
+    """
     # Veri hazırlığı - NaN değerleri temizle
-    df_clean = df_filtered.dropna(subset=['Year', 'Global_Sales', 'Platform']).copy()
-    df_clean['Year'] = df_clean['Year'].astype(int)
+    # Year load_data()'da zaten int16, tekrar cast etmeye gerek yok
+    df_clean = filter_data(*filters).dropna(subset=['Year', 'Global_Sales', 'Platform'])
     
     # Grafik karmaşık olmasın diye EN ÇOK SATAN 12 PLATFORMU alıyoruz
-    top_platforms = df_clean.groupby('Platform')['Global_Sales'].sum().nlargest(12).index
+    top_platforms = df_clean.groupby('Platform', observed=True)['Global_Sales'].sum().nlargest(12).index
     df_chart = df_clean[df_clean['Platform'].isin(top_platforms)].copy()
     
-    # Platform x Year, Global_Sales toplamı
-    df_chart = df_chart.groupby(['Platform', 'Year'])['Global_Sales'].sum().reset_index()
-    
     # Platformları çıkış yılına göre sıralayalım (Eskiden yeniye akış için)
-    platform_order = df_chart.groupby('Platform')['Year'].min().sort_values().index
-    
-    # Tüm platform-yıl kombinasyonlarını oluştur (eksik olanları 0 ile doldur)
-    # Bu, 2000'den önceki verilerin doğru gösterilmesi için önemli
-    min_year = int(df_chart['Year'].min())
-    max_year = int(df_chart['Year'].max())
-    all_years = list(range(min_year, max_year + 1))
-    all_platforms = list(df_chart['Platform'].unique())
-    
-    # Tüm kombinasyonları oluştur (pandas MultiIndex kullanarak)
-    multi_index = pd.MultiIndex.from_product([all_platforms, all_years], names=['Platform', 'Year'])
-    all_combinations = pd.DataFrame(index=multi_index).reset_index()
+    # Aynı yıl çıkanlar alfabetik kalsın diye stable sıralama
+    platform_order = df_chart.groupby('Platform', observed=True)['Year'].min().sort_values(kind='stable').index
     
-    # Mevcut verilerle birleştir ve eksik olanları 0 ile doldur
-    df_chart = all_combinations.merge(df_chart, on=['Platform', 'Year'], how='left')
-    df_chart['Global_Sales'] = df_chart['Global_Sales'].fillna(0)
+    # Platform x Year, Global_Sales toplamı - tek pivot ile, eksik olanlar 0
+    # Tüm yılları reindex ile ekliyoruz, bu 2000'den önceki verilerin doğru gösterilmesi için önemli
+    wide = df_chart.pivot_table(index='Year', columns='Platform', values='Global_Sales',
+                                aggfunc='sum', fill_value=0, observed=True)
+    wide = wide.reindex(range(int(wide.index.min()), int(wide.index.max()) + 1), fill_value=0)
     
-    # Veri tiplerini düzelt
-    df_chart['Year'] = df_chart['Year'].astype(int)
-    df_chart['Global_Sales'] = df_chart['Global_Sales'].astype(float)
-    
-    # Yıla göre sırala (her platform için)
-    df_chart = df_chart.sort_values(['Platform', 'Year']).reset_index(drop=True)
+    # Sütunları çıkış yılına göre sırala - yığın ve renk sırası buradan gelir
+    wide = wide[platform_order]
     
     # STACKED AREA CHART (YIĞILMIŞ ALAN GRAFİĞİ)
-    fig_stacked = px.area(
-        df_chart,
-        x="Year",
-        y="Global_Sales",
-        color="Platform",
-        category_orders={"Platform": list(platform_order)},  # Sıralı renklendirme
-        title=None,  # Başlığı kaldırıyoruz, Streamlit header zaten var
-        template="plotly_dark",
-        height=750  # Hover tooltip için daha fazla alan
-    )
+    # Geniş tablodan doğrudan stackgroup trace'leri; uzun formata (melt) ve px'e gerek yok
+    fig_stacked = go.Figure()
+    for platform in wide.columns:
+        fig_stacked.add_trace(go.Scatter(
+            x=wide.index.to_numpy(dtype=np.int16),  # yıllar int16 sığar
+            y=wide[platform].round(2).to_numpy(dtype=np.float32),  # 2 ondalık yeterli, float32 yarı boyutta gider
+            name=str(platform),
+            mode='lines',
+            stackgroup='one',  # Stacked area, fill='tonexty' otomatik
+            line=dict(width=0),  # Çizgi kalınlığını 0 yap, sadece alan hover'ı tetiklesin
+            hovertemplate='<b>%{fullData.name}</b><br>Year: %{x}<br>Sales: %{y:.2f}M<extra></extra>'
+        ))
     
     # Fine-tuning
     fig_stacked.update_layout(
+        template="plotly_dark",
+        height=750,  # Hover tooltip için daha fazla alan
         xaxis_title="Year",
         yaxis_title="Total Global Sales (Million)",
         legend_title="Platforms",
@@ -566,166 +910,184 @@ with tabs[3]:
         spikedistance=1000  # Spike mesafesini artırıyoruz
     )
     
-    # Hover'ın mouse'un grafikteki yerine göre o yılın verilerini göstermesi için trace'leri güncelle
-    for trace in fig_stacked.data:
-        trace.update(
-            hovertemplate='<b>%{fullData.name}</b><br>Year: %{x}<br>Sales: %{y:.2f}M<extra></extra>',
-            fill='tonexty',  # Stacked area için fill ayarı
-            line=dict(width=0)  # Çizgi kalınlığını 0 yap, sadece alan hover'ı tetiklesin
-        )
-    
-    st.plotly_chart(fig_stacked, use_container_width=True, key='plot_stacked')
+    return fig_stacked
 
-with tabs[4]:
-    st.header("Sankey Diagram: Publisher → Genre → Platform Sales Flow")
-    st.markdown("This chart shows a flow diagram of how the sales of the top 5 publishers flow to different game genres (Genre) and then to different platforms (Platform). Select a genre to highlight only its flows.")
+with tabs[3]:
+    if tabs[3].open:
+        st.header("Stacked Area Chart: Platform Popularity Over Years")
+        st.markdown("This chart shows the sales trends of the top 12 platforms by total sales over the years in a stacked format. It visualizes the rise and fall of platforms (for example, PS2 being replaced by PS3).")
     
+        fig_stacked = build_fig_stacked(filters)
+
+        st.plotly_chart(fig_stacked, use_container_width=True, key='plot_stacked', config=PLOTLY_CONFIG)
+
+@st.cache_data
+def build_sankey_flows(filters):
+    """
+    Aggregates the Publisher -> Genre -> Platform flows of the top 5 publishers.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+
+    Returns:
+        tuple: (pd.DataFrame, pd.DataFrame) the Publisher -> Genre and the
+        Genre -> Platform links, each with Source, Target and Value columns.
+
+    """
+    df_sub = filter_data(*filters)
+
     # En büyük 5 yayıncıyı bul (Global_Sales toplamına göre - filtrelenmiş veriden)
-    top_publishers = df_filtered.groupby('Publisher')['Global_Sales'].sum().nlargest(5).index.tolist()
-    df_sankey = df_filtered[df_filtered['Publisher'].isin(top_publishers)].copy()
-    
+    top_publishers = df_sub.groupby('Publisher', observed=True)['Global_Sales'].sum().nlargest(5).index.tolist()
+    df_sankey = df_sub[df_sub['Publisher'].isin(top_publishers)].copy()
+
     # Publisher -> Genre -> Platform akışını hesapla
     # Kaynak: Publisher, Hedef 1: Genre, Hedef 2: Platform
     # İki aşamalı akış: Publisher->Genre ve Genre->Platform
-    
+
+    # Veriyi tek sefer tara: Publisher x Genre x Platform toplamları (birkaç yüz satır)
+    flows = df_sankey.groupby(['Publisher', 'Genre', 'Platform'], observed=True)['Global_Sales'].sum()
+
     # 1. Publisher -> Genre akışı
-    pub_genre = df_sankey.groupby(['Publisher', 'Genre'])['Global_Sales'].sum().reset_index()
+    pub_genre = flows.groupby(level=['Publisher', 'Genre'], observed=True).sum().reset_index()
     pub_genre.columns = ['Source', 'Target', 'Value']
-    
+
     # 2. Genre -> Platform akışı (aynı publisher'lar için)
-    genre_platform = df_sankey.groupby(['Genre', 'Platform'])['Global_Sales'].sum().reset_index()
+    genre_platform = flows.groupby(level=['Genre', 'Platform'], observed=True).sum().reset_index()
     genre_platform.columns = ['Source', 'Target', 'Value']
-    
-    # Tüm node'ları topla (unique değerler)
-    all_nodes = set()
-    all_nodes.update(pub_genre['Source'].unique())
-    all_nodes.update(pub_genre['Target'].unique())
-    all_nodes.update(genre_platform['Source'].unique())
-    all_nodes.update(genre_platform['Target'].unique())
-    
+    return pub_genre, genre_platform
+
+@st.cache_data
+def build_sankey_node_colors(node_list, publisher_nodes, genre_nodes, platform_nodes):
+    """
+    Assigns every Sankey node its palette color by node type.
+
+    Args:
+        node_list (tuple): All node labels, in node index order.
+        publisher_nodes (tuple): Sorted publisher labels.
+        genre_nodes (tuple): Sorted genre labels.
+        platform_nodes (tuple): Sorted platform labels.
+
+    Returns:
+        list: One color per entry of node_list.
+
+    """
+    # Renk paletleri - ilk N node kendi paletinden; palet yetmezse fazlası
+    # henüz kullanılmamış uzun qualitative renklerden gelir, renkler tekrar etmez
+    palettes = [
+        (px.colors.qualitative.Set1, len(publisher_nodes)),
+        (px.colors.qualitative.Pastel, len(genre_nodes)),
+        (px.colors.qualitative.Set3, len(platform_nodes)),
+    ]
+    used = {c for colors, n in palettes for c in colors[:n]}
+    spare = iter([
+        c for c in dict.fromkeys(px.colors.qualitative.Light24 + px.colors.qualitative.Alphabet + px.colors.qualitative.Dark24)
+        if c not in used
+    ])
+    publisher_colors, genre_colors, platform_colors = [
+        colors[:n] + [next(spare) for _ in range(n - len(colors))] for colors, n in palettes
+    ]
+
+    # Node renklerini atama (orijinal renkler), her node'a kendi rengi
+    publisher_color_map = dict(zip(publisher_nodes, publisher_colors))
+    genre_color_map = dict(zip(genre_nodes, genre_colors))
+    platform_color_map = dict(zip(platform_nodes, platform_colors))
+
+    node_colors = []
+    for node in node_list:
+        if node in publisher_color_map:
+            node_colors.append(publisher_color_map[node])
+        elif node in genre_color_map:
+            node_colors.append(genre_color_map[node])
+        elif node in platform_color_map:
+            node_colors.append(platform_color_map[node])
+        else:
+            node_colors.append('#d3d3d3')
+    return node_colors
+
+@st.cache_data
+def build_sankey_graph(filters):
+    """
+    Builds the Sankey node list and link arrays for a filter state.
+
+    Everything here depends only on the filtered data, not on the
+    highlighted genre, so switching the highlight reuses it.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+
+    Returns:
+        tuple: (list, tuple, list, np.ndarray, np.ndarray, np.ndarray) the
+        node labels, the sorted genre labels, the node base colors, and
+        the link source indices, target indices and values.
+
+    """
+    pub_genre, genre_platform = build_sankey_flows(filters)
+
+    # Tüm node'ları topla (unique değerler) - tek bir Index üzerinde, alfabetik sırada
+    nodes = pd.Index(pub_genre['Source'].astype(object)).append([
+        pd.Index(pub_genre['Target'].astype(object)),
+        pd.Index(genre_platform['Source'].astype(object)),
+        pd.Index(genre_platform['Target'].astype(object))
+    ]).unique().sort_values()
+
     # Node listesi oluştur
-    node_list = sorted(list(all_nodes))
-    node_dict = {node: idx for idx, node in enumerate(node_list)}
-    
+    node_list = nodes.tolist()
+
     # Node tiplerini belirle (Publisher, Genre, Platform)
-    publisher_nodes = set(pub_genre['Source'].unique())
-    genre_nodes = set(pub_genre['Target'].unique())
-    platform_nodes = set(genre_platform['Target'].unique())
-    
-    # Genre seçimi için dropdown
-    all_genres_list = sorted(list(genre_nodes))
-    selected_genre = st.selectbox(
-        "Select a Genre to Highlight:",
-        options=['All'] + all_genres_list,
-        index=0,
-        key='sankey_genre_selector'
-    )
-    
-    # Renk paletleri
-    publisher_colors = px.colors.qualitative.Set1[:len(publisher_nodes)]
-    genre_colors = px.colors.qualitative.Pastel[:len(genre_nodes)]
-    platform_colors = px.colors.qualitative.Set3[:len(platform_nodes)]
-    
-    # Node renklerini atama (orijinal renkler)
-    publisher_color_map = {pub: publisher_colors[i % len(publisher_colors)] 
-                          for i, pub in enumerate(sorted(publisher_nodes))}
-    genre_color_map = {genre: genre_colors[i % len(genre_colors)] 
-                      for i, genre in enumerate(sorted(genre_nodes))}
-    platform_color_map = {platform: platform_colors[i % len(platform_colors)] 
-                         for i, platform in enumerate(sorted(platform_nodes))}
-    
+    publisher_nodes = tuple(sorted(set(pub_genre['Source'].unique())))
+    genre_nodes = tuple(sorted(set(pub_genre['Target'].unique())))
+    platform_nodes = tuple(sorted(set(genre_platform['Target'].unique())))
+
+    # Node renkleri (orijinal renkler)
+    base_colors = build_sankey_node_colors(tuple(node_list), publisher_nodes, genre_nodes, platform_nodes)
+
+    # Link'leri oluştur: Publisher -> Genre ve Genre -> Platform, satır satır dolaşmadan index dizileri
+    links = pd.concat([pub_genre, genre_platform], ignore_index=True)
+    link_source = nodes.get_indexer(links['Source'].astype(object))
+    link_target = nodes.get_indexer(links['Target'].astype(object))
+    link_value = links['Value'].round(2).to_numpy(dtype=np.float32)  # 2 ondalık, float32 olarak gönder
+    return node_list, genre_nodes, base_colors, link_source, link_target, link_value
+
+@st.cache_data
+def build_fig_sankey(filters, selected_genre):
+    """
+    Builds the Sankey figure with one genre's flows highlighted.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+        selected_genre (str): Genre to highlight, or 'All'.
+
+    Returns:
+        go.Figure: The Sankey figure.
+
+    """
+    # Node ve link yapısı filtreye bağlı, cache'ten gelir; burada sadece vurgulama hesaplanır
+    node_list, _, base_colors, link_source, link_target, link_value = build_sankey_graph(filters)
+
     # Seçilen genre'ye göre renkleri belirle
-    node_colors = []
-    highlighted_nodes = set()
-    
     if selected_genre == 'All':
         # Tüm node'lar renkli
-        for node in node_list:
-            if node in publisher_color_map:
-                node_colors.append(publisher_color_map[node])
-            elif node in genre_color_map:
-                node_colors.append(genre_color_map[node])
-            elif node in platform_color_map:
-                node_colors.append(platform_color_map[node])
-            else:
-                node_colors.append('#d3d3d3')
-        highlighted_nodes = set(node_list)
+        highlighted_mask = np.ones(len(node_list), dtype=bool)
     else:
         # Sadece seçilen genre ve onunla bağlantılı node'lar renkli
-        highlighted_nodes.add(selected_genre)
-        
-        # Seçilen genre'ye bağlı publisher'ları bul
-        connected_publishers = set(pub_genre[pub_genre['Target'] == selected_genre]['Source'].unique())
-        highlighted_nodes.update(connected_publishers)
-        
-        # Seçilen genre'ye bağlı platform'ları bul
-        connected_platforms = set(genre_platform[genre_platform['Source'] == selected_genre]['Target'].unique())
-        highlighted_nodes.update(connected_platforms)
-        
-        # Node renklerini atama (highlighted olanlar renkli, diğerleri gri)
-        for node in node_list:
-            if node in highlighted_nodes:
-                if node in publisher_color_map:
-                    node_colors.append(publisher_color_map[node])
-                elif node in genre_color_map:
-                    node_colors.append(genre_color_map[node])
-                elif node in platform_color_map:
-                    node_colors.append(platform_color_map[node])
-                else:
-                    node_colors.append('#d3d3d3')
-            else:
-                node_colors.append('#d3d3d3')  # Gri
-    
-    # Link'leri oluştur ve renklerini belirle
-    links = []
-    link_colors = []
-    
-    # Hex rengi rgba'ya çeviren yardımcı fonksiyon
-    def hex_to_rgba(hex_color, alpha=0.6):
-        hex_color = hex_color.lstrip('#')
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        return f'rgba({r},{g},{b},{alpha})'
-    
-    # Publisher -> Genre link'leri
-    for _, row in pub_genre.iterrows():
-        source_idx = node_dict[row['Source']]
-        target_idx = node_dict[row['Target']]
-        links.append({
-            'source': source_idx,
-            'target': target_idx,
-            'value': row['Value']
-        })
-        # Link rengi: eğer her iki node da highlighted ise renkli, değilse gri
-        if row['Source'] in highlighted_nodes and row['Target'] in highlighted_nodes:
-            source_color = node_colors[source_idx]
-            if source_color.startswith('#'):
-                link_colors.append(hex_to_rgba(source_color, 0.5))
-            else:
-                link_colors.append(source_color)
-        else:
-            link_colors.append('rgba(128,128,128,0.3)')  # Gri ve şeffaf
-    
-    # Genre -> Platform link'leri
-    for _, row in genre_platform.iterrows():
-        source_idx = node_dict[row['Source']]
-        target_idx = node_dict[row['Target']]
-        links.append({
-            'source': source_idx,
-            'target': target_idx,
-            'value': row['Value']
-        })
-        # Link rengi: eğer her iki node da highlighted ise renkli, değilse gri
-        if row['Source'] in highlighted_nodes and row['Target'] in highlighted_nodes:
-            source_color = node_colors[source_idx]
-            if source_color.startswith('#'):
-                link_colors.append(hex_to_rgba(source_color, 0.5))
-            else:
-                link_colors.append(source_color)
-        else:
-            link_colors.append('rgba(128,128,128,0.3)')  # Gri ve şeffaf
+        genre_idx = node_list.index(selected_genre)
+        highlighted_mask = np.zeros(len(node_list), dtype=bool)
+        highlighted_mask[genre_idx] = True
     
+        # Seçilen genre'ye bağlı publisher'lar (genre'ye gelen link'ler) ve platform'lar (genre'den çıkan link'ler)
+        highlighted_mask[link_source[link_target == genre_idx]] = True
+        highlighted_mask[link_target[link_source == genre_idx]] = True
+
+    # Node renklerini atama (highlighted olanlar renkli, diğerleri gri)
+    node_colors = np.where(highlighted_mask, np.array(base_colors, dtype=object), '#d3d3d3')
+
+    # Link rengi: eğer her iki node da highlighted ise kaynak node'un rengi, değilse gri
+    lit = highlighted_mask[link_source] & highlighted_mask[link_target]
+    # Yanan link'in kaynağı her zaman highlighted olduğundan temel renk kullanılır; hex'ler bir kez çevrilir
+    rgba_cache = {c: hex_to_rgba(c, 0.5) for c in set(base_colors) if c.startswith('#')}
+    node_link_colors = pd.Series(base_colors, dtype=object).replace(rgba_cache).to_numpy()
+    link_colors = np.where(lit, node_link_colors[link_source], 'rgba(128,128,128,0.3)')  # Gri ve şeffaf
+
     # Sankey diagram oluştur
     fig_sankey = go.Figure(data=[go.Sankey(
         node=dict(
@@ -736,110 +1098,219 @@ with tabs[4]:
             color=node_colors
         ),
         link=dict(
-            source=[link['source'] for link in links],
-            target=[link['target'] for link in links],
-            value=[link['value'] for link in links],
+            source=link_source,
+            target=link_target,
+            value=link_value,
             color=link_colors,
             hovertemplate='%{source.label} → %{target.label}<br>Sales: %{value:.2f}M<extra></extra>'
         )
     )])
-    
+
     fig_sankey.update_layout(
         title_text="Top 5 Publishers Sales Flow: Publisher → Genre → Platform",
         font_size=10,
-        height=800
+        height=800,
+        hovermode='closest',
+        uirevision=f'sankey-{filters}',  # Vurgu değişince sürüklenen node'lar yerinde kalsın, filtre değişince sıfırlanır
+        transition_duration=0  # Güncellemelerde animasyon yok
     )
-    
-    st.plotly_chart(fig_sankey, use_container_width=True, key='plot_sankey')
+    return fig_sankey
 
-with tabs[5]:
+@st.fragment
+def render_sankey_tab(filters):
+    """
+    Renders the Sankey tab.
+
+    A fragment: changing the highlighted genre reruns only this tab.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+
+    """
+    st.header("Sankey Diagram: Publisher → Genre → Platform Sales Flow")
+    st.markdown("This chart shows a flow diagram of how the sales of the top 5 publishers flow to different game genres (Genre) and then to different platforms (Platform). Select a genre to highlight only its flows.")
+
+    # Dropdown için genre listesi, filtreye bağlı graf yapısından (cache)
+    genre_nodes = build_sankey_graph(filters)[1]
+
+    # Genre seçimi için dropdown
+    all_genres_list = list(genre_nodes)
+    selected_genre = st.selectbox(
+        "Select a Genre to Highlight:",
+        options=['All'] + all_genres_list,
+        key='sankey_genre_selector'
+    )
+
+    # Figür de (filtre, genre) başına cache'lenir; aynı seçime dönüldüğünde yeniden kurulmaz
+    fig_sankey = build_fig_sankey(filters, selected_genre)
+
+    st.plotly_chart(fig_sankey, use_container_width=True, key='plot_sankey', config=PLOTLY_CONFIG)
+
+with tabs[4]:
+    if tabs[4].open:
+        render_sankey_tab(filters)
+
+@st.cache_data
+def build_publisher_ranking(filters):
+    """
+    Lists the publishers by total global sales, best first.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+
+    Returns:
+        list: Publisher names in descending order of Global_Sales.
+
+    """
+    df_sub = filter_data(*filters)
+    publisher_sales = df_sub.groupby('Publisher', observed=True)['Global_Sales'].sum().sort_values(ascending=False)
+    return publisher_sales.index.tolist()
+
+@st.cache_data
+def build_publisher_year_matrix(filters):
+    """
+    Sums global sales per publisher and year in one groupby.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+
+    Returns:
+        pd.DataFrame: One row per publisher, one column per year; NaN
+        where the publisher released nothing that year.
+
+    """
+    df_sub = filter_data(*filters)
+    return df_sub.groupby(['Publisher', 'Year'], observed=True)['Global_Sales'].sum().unstack('Year')
+
+@st.fragment
+def render_line_tab(filters):
+    """
+    Renders the publisher line chart tab.
+
+    A fragment: picking a publisher or toggling the range slider reruns
+    only this tab.
+
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+
+    """
     st.header("Line Chart: Publisher Sales Trend Over Years")
     st.markdown("This chart shows the trend of total global sales for selected publishers over the years. You can select a publisher from the dropdown menu, and perform dragging or zooming on the chart.")
-    
+
     # Publisher listesini al (filtrelenmiş veriden, en çok satış yapanlardan başlayarak)
-    publisher_sales = df_filtered.groupby('Publisher')['Global_Sales'].sum().sort_values(ascending=False)
-    all_publishers = publisher_sales.index.tolist()
-    
+    all_publishers = build_publisher_ranking(filters)
+
     # Dropdown menu for publisher selection
     selected_publisher = st.selectbox(
         "Select Publisher:",
         options=all_publishers,
-        index=0 if all_publishers else None
+        key='line_publisher'
     )
-    
+
+    # Range slider grafiği ikinci kez çizer, sadece istenirse açılır
+    show_slider = st.checkbox(
+        "Show range slider",
+        help="Adds a miniature of the trend below the chart for dragging the visible year range.",
+        key='line_rangeslider'
+    )
+
     # Seçilen Publisher'ın yıllara göre toplam satışlarını hesapla (filtrelenmiş veriden)
-    publisher_yearly_sales = df_filtered[df_filtered['Publisher'] == selected_publisher].groupby('Year')['Global_Sales'].sum().reset_index()
-    publisher_yearly_sales = publisher_yearly_sales.sort_values('Year')
-    
-    # Create line chart
-    fig_line = px.line(
-        publisher_yearly_sales,
-        x='Year',
-        y='Global_Sales',
-        title=f'{selected_publisher} - Total Sales Trend Over Years',
-        labels={
-            'Year': 'Year',
-            'Global_Sales': 'Total Sales (Million)'
-        },
-        markers=True
+    # Publisher x Year tablosundan tek satır okunur, her seçimde yeniden groupby yok
+    # reindex: filtre hiç publisher bırakmazsa (None) KeyError yerine boş seri, grafik boş çizilir
+    publisher_yearly_sales = (
+        build_publisher_year_matrix(filters).reindex([selected_publisher]).iloc[0]
+        .dropna().rename_axis('Year').rename('Global_Sales').reset_index()
     )
-    
+
+    # Create line chart
+    # go.Scatter (SVG) on purpose: the range slider does not draw WebGL traces, and there are at most ~40 points
+    fig_line = go.Figure(go.Scatter(
+        x=publisher_yearly_sales['Year'],
+        y=publisher_yearly_sales['Global_Sales'].round(2).to_numpy(dtype=np.float32),  # 2 ondalık, float32 olarak gönder
+        mode='lines+markers',
+        hovertemplate='Year: %{x}<br>Total Sales: %{y:.2f}M<extra></extra>'
+    ))
+
     # Interactive features: zoom, pan, drag
     fig_line.update_layout(
+        title=f'{selected_publisher} - Total Sales Trend Over Years',
         xaxis_title="Year",
         yaxis_title="Total Sales (Million)",
         hovermode='x unified',
         xaxis=dict(
-            rangeslider=dict(visible=True),  # Range slider at the bottom
+            rangeslider=dict(visible=show_slider),  # Range slider at the bottom
             type="linear"
         ),
-        dragmode='zoom'  # Default zoom mode
-    )
-    
-    # Update hover template
-    fig_line.update_traces(
-        hovertemplate='Year: %{x}<br>Total Sales: %{y:.2f}M<extra></extra>'
+        dragmode='zoom',  # Default zoom mode
+        uirevision='publisher-line',  # Sabit: publisher değişince sadece trace verisi güncellenir, zoom/range korunur
+        transition_duration=0  # Güncellemelerde animasyon yok
     )
-    
-    st.plotly_chart(fig_line, use_container_width=True, key='plot_line')
 
-with tabs[8]:
-    st.header("Top 20 Games (Hilmi): Best-Selling Games of All Time")
-    st.markdown("Shows the top 20 games by total global sales from the filtered dataset.")
+    st.plotly_chart(fig_line, use_container_width=True, key='plot_line', config=PLOTLY_CONFIG)
 
-    # Prepared by: Hilmi
-    st.markdown("**Prepared by: Hilmi**")
+with tabs[5]:
+    if tabs[5].open:
+        render_line_tab(filters)
 
-    # Sort by Global_Sales and select the top 20
-    df_top_20 = df_filtered.sort_values(by='Global_Sales', ascending=False).head(20)
-    
-    # Oyun isimlerini satış sırasına göre listele (en yüksekten en düşüğe)
-    # Bu sıralama Y eksenindeki sıralamayı belirleyecek
-    name_order = df_top_20['Name'].tolist()
+@st.cache_data
+def build_fig_top20(filters):
+    """
+    Builds the ranked bar chart of the 20 best-selling games.
 
+    Args:
+        filters (tuple): Sidebar filter key, see filter_data().
+
+    Returns:
+        go.Figure: The bar chart figure.
+
+    """
+    # Select the top 20 by Global_Sales (partial selection, no full sort)
+    df_top_20 = filter_data(*filters).nlargest(20, 'Global_Sales')
+    sales = df_top_20['Global_Sales'].round(2).to_numpy(dtype=np.float32)  # 2 decimals are all the chart shows
+    
     # Create the Ranked Bar Chart
-    fig_bar_top = px.bar(
-        df_top_20,
-        y='Name', # Game Name (Y-axis)
-        x='Global_Sales', # Global Sales (X-axis)
+    # Publisher, Platform, and Year go to the tooltip (hover) through customdata and one shared template
+    fig_bar_top = go.Figure(go.Bar(
+        y=df_top_20['Name'].astype(str), # Game Name (Y-axis)
+        x=sales, # Global Sales (X-axis)
         orientation='h', # Horizontal bar chart
-        color='Global_Sales', # Color by Sales value
-        color_continuous_scale=px.colors.sequential.Plotly3,
-        title='Top 20 Games by Global Sales',
-        # Add Publisher, Platform, and Year to the tooltip (hover)
-        hover_data=['Publisher', 'Platform', 'Year'],
-        labels={'Global_Sales': 'Global Sales', 'Name': 'Game Name'},
-        category_orders={'Name': name_order}  # Oyun isimlerini satış sırasına göre sırala
-    )
+        marker=dict(
+            color=sales, # Color by Sales value
+            colorscale=px.colors.sequential.Plotly3,
+            showscale=True,
+            colorbar=dict(title='Global Sales')
+        ),
+        customdata=df_top_20[['Publisher', 'Platform', 'Year']].astype(object).to_numpy(),
+        hovertemplate=(
+            'Global Sales=%{x}<br>Game Name=%{y}<br>Publisher=%{customdata[0]}'
+            '<br>Platform=%{customdata[1]}<br>Year=%{customdata[2]}<extra></extra>'
+        )
+    ))
     
-    # Y-axis order: en yüksek satış en üstte (horizontal bar'da descending = en üstte en yüksek)
+    # Y-axis order: en yüksek satış en üstte
+    # Satırlar zaten satışa göre azalan sırada; kategori sırası veri sırası, ekseni ters çevirmek yeterli
     fig_bar_top.update_layout(
+        title='Top 20 Games by Global Sales',
+        xaxis_title='Global Sales',
+        yaxis_title='Game Name',
         yaxis={
-            'categoryorder': 'array',
-            'categoryarray': name_order,
+            'autorange': 'reversed',
             'tickmode': 'linear'  # Tüm tick'leri göster
         },
-        height=max(600, len(df_top_20) * 30)  # Her oyun için yeterli yükseklik
+        height=min(900, max(600, len(df_top_20) * 30)),  # Her oyun için yeterli yükseklik, en fazla 900px
+        uirevision=f'top20-{filters}',  # keep zoom/pan across reruns, reset when the filters swap in other games
+        transition_duration=0  # no animated updates
     )
+    return fig_bar_top
+
+with tabs[8]:
+    if tabs[8].open:
+        st.header("Top 20 Games (Hilmi): Best-Selling Games of All Time")
+        st.markdown("Shows the top 20 games by total global sales from the filtered dataset.")
+
+        # Prepared by: Hilmi
+        st.markdown("**Prepared by: Hilmi**")
+
+        fig_bar_top = build_fig_top20(filters)
 
-    st.plotly_chart(fig_bar_top, use_container_width=True, key='plot_top20')
+        st.plotly_chart(fig_bar_top, use_container_width=True, key='plot_top20', config=PLOTLY_CONFIG)